@@ -1,5 +1,3 @@
 from . import hooks
-from .context import EventContext
+from .context import EventContext, ctx
 from .client import ContextClient
-
-ctx: EventContext = EventContext()
@@ -1,13 +1,23 @@
-from .context import EventContext
+from .context import EventContext, ctx
 
 
 class ContextClient:
     """Class to be subclassed by discord.py Client to register EventContext hooks."""
     def __init__(self, *args, **kwargs):
         # noinspection PyTypeChecker
-        EventContext.ctx.set_client(self)
+        ctx.set_client(self)
         super().__init__(*args, **kwargs)
 
+    def _has_listener(self, event_name: str) -> bool:
+        """Whether any event handler or listener will receive the given event."""
+        method = "on_" + event_name
+        return (
+            hasattr(self, method)
+            or event_name in self._listeners
+            or method in getattr(self, "extra_events", ())
+        )
+
     def dispatch(self, event_name, *args, **kwargs):
-        EventContext.ctx.event_hook(event_name, *args, **kwargs)
+        if event_name in EventContext.hook_events or self._has_listener(event_name):
+            ctx.event_hook(event_name, *args, **kwargs)
         super().dispatch(event_name, *args, **kwargs)
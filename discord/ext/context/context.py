@@ -3,27 +3,18 @@ from __future__ import annotations
 import logging
 import typing as t
 from contextlib import contextmanager
+from functools import partial
 
 from contextvars import ContextVar
 
 import discord
 from discord.ext import commands
 
-from .types import MemberUser, Emoji
+from .types import MemberUser, Emoji, AnyMessage, MessageRef
 
 log = logging.getLogger(__name__)
 
 
-_ctx_message: ContextVar[t.Optional[discord.PartialMessage]] = ContextVar("message")
-_ctx_emoji: ContextVar[t.Optional[Emoji]] = ContextVar("emoji")
-_ctx_user: ContextVar[t.Optional[MemberUser]] = ContextVar("user")
-_ctx_channel: ContextVar[t.Optional[discord.abc.Messageable]] = ContextVar("channel")
-_ctx_guild: ContextVar[t.Optional[discord.Guild]] = ContextVar("guild")
-_ctx_cmd: ContextVar[t.Optional[commands.Context]] = ContextVar("cmd_ctx")
-_ctx_event: ContextVar[t.Optional[str]] = ContextVar("event")
-_ctx_client: ContextVar[t.Optional[discord.Client]] = ContextVar("client")
-
-
 class ContextNotSet(Exception):
     """Raised when an EventContext value was accessed before it was set."""
     pass
@@ -33,182 +24,278 @@ class _NoValue:
     pass
 
 
+class _CtxState:
+    """
+    Snapshot of all context values for a single frame, copied rather than changed when values are set.
+
+    The one exception is `message`, which may hold a `(channel, id)` pair that is resolved to a
+    `discord.PartialMessage` in place on first access, and so is shared by every context copied from it.
+    """
+
+    __slots__ = ("message", "emoji", "user", "channel", "guild", "cmd", "event", "client")
+
+    def __init__(self):
+        self.message = _NoValue
+        self.emoji = _NoValue
+        self.user = _NoValue
+        self.channel = _NoValue
+        self.guild = _NoValue
+        self.cmd = _NoValue
+        self.event = _NoValue
+        self.client = _NoValue
+
+    def _copy(self) -> _CtxState:
+        """Return a shallow copy of the state."""
+        state = _CtxState.__new__(_CtxState)
+        state.message = self.message
+        state.emoji = self.emoji
+        state.user = self.user
+        state.channel = self.channel
+        state.guild = self.guild
+        state.cmd = self.cmd
+        state.event = self.event
+        state.client = self.client
+        return state
+
+    def _restore(self, previous: _CtxState, names: t.Iterable[str]) -> _CtxState:
+        """Return a copy of the state with only the named fields reverted to their values in `previous`."""
+        state = self._copy()
+        for name in names:
+            setattr(state, name, getattr(previous, name))
+        return state
+
+
+_ctx_state: ContextVar[_CtxState] = ContextVar("ectx", default=_CtxState())
+_get_state = _ctx_state.get
+_set_state = _ctx_state.set
+
+
+def _event_name(state: _CtxState) -> t.Optional[str]:
+    """The event name of the given state, or None if no event is set."""
+    return None if state.event is _NoValue else state.event
+
+
 class EventContext:
     """Holder and manager for all context values originating from triggered discord.py events."""
 
-    hooks: t.Dict[str, t.Callable] = dict()
-    ctx = None
+    __slots__ = ()
 
-    def __new__(cls, *args, **kwds):
-        """Set the class to act as a singleton."""
-        if cls.ctx is not None:
-            return cls.ctx
-        cls.ctx = object.__new__(cls)
-        return cls.ctx
+    hooks: t.Dict[str, t.Callable] = dict()
+    # Read-only view of the events in `hooks`, kept in sync by `register_hook` and `register_hooks`.
+    hook_events: t.FrozenSet[str] = frozenset()
 
     def __repr__(self):
         """A representative view of the current context."""
+        state = _get_state()
         ctx_previews = []
-        with self.default(None):
-            if self.event:
-                ctx_previews.append(f"event='{self.event}'")
-            if self.message:
-                ctx_previews.append(f"message={self.message.id}")
-            if self.emoji:
-                ctx_previews.append(f"emoji='{self.emoji.name}'")
-            if self.user:
-                ctx_previews.append(f"user='{self.user}'")
-            if self.channel:
-                ctx_previews.append(f"channel='{self.channel}'")
-            if self.guild:
-                ctx_previews.append(f"guild='{self.guild}'")
-            if self.cmd_ctx:
-                ctx_previews.append(f"command='{self.cmd_ctx.command}'")
+        if state.event is not _NoValue and state.event:
+            ctx_previews.append(f"event='{state.event}'")
+        if state.message is not _NoValue and state.message:
+            if type(state.message) is not tuple:
+                ctx_previews.append(f"message={state.message.id}")
+            elif state.message[0] is not None:
+                ctx_previews.append(f"message={state.message[1]}")
+        if state.emoji is not _NoValue and state.emoji:
+            ctx_previews.append(f"emoji='{state.emoji.name}'")
+        if state.user is not _NoValue and state.user:
+            ctx_previews.append(f"user='{state.user}'")
+        if state.channel is not _NoValue and state.channel:
+            ctx_previews.append(f"channel='{state.channel}'")
+        if state.guild is not _NoValue and state.guild:
+            ctx_previews.append(f"guild='{state.guild}'")
+        if state.cmd is not _NoValue and state.cmd:
+            ctx_previews.append(f"command='{state.cmd.command}'")
 
         output = ", ".join(ctx_previews)
         return f"<EventContext {output}>"
 
     @property
-    def message(self) -> t.Optional[discord.PartialMessage]:
+    def message(self) -> t.Optional[AnyMessage]:
         """The current message in context."""
-        try:
-            return _ctx_message.get()
-        except LookupError:
-            with self.default(None):
-                raise ContextNotSet(f"Event '{self.event}' does not set a value for `ctx.message`.")
+        state = _get_state()
+        value = state.message
+        if value is _NoValue:
+            raise ContextNotSet(f"Event '{_event_name(state)}' does not set a value for `ctx.message`.")
+        if type(value) is tuple:
+            channel, message_id = value
+            if channel is None:
+                raise ContextNotSet(
+                    f"Event '{_event_name(state)}' has no cached channel for message {message_id}, "
+                    f"so `ctx.message` can't be resolved."
+                )
+            value = state.message = discord.PartialMessage(channel=channel, id=message_id)
+        return value
 
     @property
     def emoji(self) -> t.Optional[Emoji]:
         """The current emoji in context."""
-        try:
-            return _ctx_emoji.get()
-        except LookupError:
-            with self.default(None):
-                raise ContextNotSet(f"Event '{self.event}' does not set a value for `ctx.emoji`.")
+        state = _get_state()
+        value = state.emoji
+        if value is _NoValue:
+            raise ContextNotSet(f"Event '{_event_name(state)}' does not set a value for `ctx.emoji`.")
+        return value
 
     @property
     def user(self) -> t.Optional[MemberUser]:
         """The current user in context."""
-        try:
-            return _ctx_user.get()
-        except LookupError:
-            with self.default(None):
-                raise ContextNotSet(f"Event '{self.event}' does not set a value for `ctx.user`.")
+        state = _get_state()
+        value = state.user
+        if value is _NoValue:
+            raise ContextNotSet(f"Event '{_event_name(state)}' does not set a value for `ctx.user`.")
+        return value
 
     @property
     def channel(self) -> t.Optional[discord.abc.Messageable]:
         """The current channel in context."""
-        try:
-            return _ctx_channel.get()
-        except LookupError:
-            with self.default(None):
-                raise ContextNotSet(f"Event '{self.event}' does not set a value for `ctx.channel`.")
+        state = _get_state()
+        value = state.channel
+        if value is _NoValue:
+            raise ContextNotSet(f"Event '{_event_name(state)}' does not set a value for `ctx.channel`.")
+        return value
 
     @property
     def guild(self) -> t.Optional[discord.Guild]:
         """The current guild in context."""
-        try:
-            return _ctx_guild.get()
-        except LookupError:
-            with self.default(None):
-                raise ContextNotSet(f"Event '{self.event}' does not set a value for `ctx.guild`.")
+        state = _get_state()
+        value = state.guild
+        if value is _NoValue:
+            raise ContextNotSet(f"Event '{_event_name(state)}' does not set a value for `ctx.guild`.")
+        return value
 
     @property
     def cmd_ctx(self) -> t.Optional[commands.Context]:
         """The current command context instance."""
-        try:
-            return _ctx_cmd.get()
-        except LookupError:
-            with self.default(None):
-                raise ContextNotSet(f"Only 'command' events will set the `ctx.cmd_ctx` value, not '{self.event}' event.")
+        state = _get_state()
+        value = state.cmd
+        if value is _NoValue:
+            raise ContextNotSet(f"Only 'command' events will set the `ctx.cmd_ctx` value, not '{_event_name(state)}' event.")
+        return value
 
     @property
     def event(self) -> t.Optional[str]:
         """The current event in context."""
-        try:
-            return _ctx_event.get()
-        except LookupError:
-            with self.default(None):
-                raise ContextNotSet(f"EventContext has no origin event in the current call stack.")
+        value = _get_state().event
+        if value is _NoValue:
+            raise ContextNotSet(f"EventContext has no origin event in the current call stack.")
+        return value
 
     @property
     def client(self) -> t.Optional[discord.Client]:
         """The current discord.py client in context."""
-        try:
-            return _ctx_client.get()
-        except LookupError:
-            with self.default(None):
-                raise ContextNotSet(f"Event '{self.event}' does not set a value for `ctx.client`.")
+        state = _get_state()
+        value = state.client
+        if value is _NoValue:
+            raise ContextNotSet(f"Event '{_event_name(state)}' does not set a value for `ctx.client`.")
+        return value
 
-    @property
-    def bot(self) -> t.Optional[discord.Client]:
-        """The current discord.py client in context. Alias of `ctx.client`."""
-        return self.client
+    bot = client
 
     def set(
         self,
         *,
-        message: discord.PartialMessage = _NoValue,
+        message: t.Union[AnyMessage, MessageRef] = _NoValue,
         emoji: Emoji = _NoValue,
         user: MemberUser = _NoValue,
         channel: discord.abc.Messageable = _NoValue,
         guild: discord.Guild = _NoValue,
 
     ) -> EventContext:
-        """Set the context values given."""
+        """Set the context values given, with the message optionally as a lazily resolved `(channel, id)` pair."""
+        if message is _NoValue and emoji is _NoValue and user is _NoValue and channel is _NoValue and guild is _NoValue:
+            return self
+
+        state = _get_state()._copy()
         if message is not _NoValue:
-            _ctx_message.set(message)
+            state.message = message
         if emoji is not _NoValue:
-            _ctx_emoji.set(emoji)
+            state.emoji = emoji
         if user is not _NoValue:
-            _ctx_user.set(user)
+            state.user = user
         if channel is not _NoValue:
-            _ctx_channel.set(channel)
+            state.channel = channel
         if guild is not _NoValue:
-            _ctx_guild.set(guild)
+            state.guild = guild
+        _set_state(state)
+        return self
+
+    def set_message_context(
+        self,
+        channel: discord.abc.Messageable,
+        message_id: int,
+        guild: t.Optional[discord.Guild],
+        user: t.Optional[MemberUser] = _NoValue,
+        emoji: Emoji = _NoValue,
+    ) -> EventContext:
+        """Set the context values for a message-based event in a single update, without keyword arguments."""
+        state = _get_state()._copy()
+        state.message = (channel, message_id)
+        state.channel = channel
+        state.guild = guild
+        if user is not _NoValue:
+            state.user = user
+        if emoji is not _NoValue:
+            state.emoji = emoji
+        _set_state(state)
         return self
 
     def set_event(self, event: str):
         """Set the event for the context"""
-        _ctx_event.set(event)
+        state = _get_state()._copy()
+        state.event = event
+        _set_state(state)
         return self.hooks.get(event)
 
     def set_client(self, client: discord.Client):
         """Set the client for the context."""
-        _ctx_client.set(client)
+        state = _get_state()._copy()
+        state.client = client
+        _set_state(state)
         return self
 
     def set_cmd_ctx(self, cmd_ctx: commands.Context):
         """Set the command context for the event context."""
-        _ctx_cmd.set(cmd_ctx)
-        self.set(
-            message=discord.PartialMessage(channel=cmd_ctx.channel, id=cmd_ctx.message.id),
-            user=cmd_ctx.author,
-            channel=cmd_ctx.channel,
-            guild=cmd_ctx.guild,
-        )
+        state = _get_state()._copy()
+        state.message = cmd_ctx.message
+        state.user = cmd_ctx.author
+        state.channel = cmd_ctx.channel
+        state.guild = cmd_ctx.guild
+        state.cmd = cmd_ctx
+        _set_state(state)
         return self
 
     def event_hook(self, event_name: str, *args, **_kwargs):
         """Sets the event value and runs the event hook if one is registered."""
-        hook = self.set_event(event_name)
-        if hook:
+        state = _get_state()._copy()
+        state.event = event_name
+        _set_state(state)
+        hook = self.hooks.get(event_name)
+        if hook is not None:
             hook(self, *args)
 
+    @staticmethod
+    def _add_hooks(events: t.Tuple[str, ...], func: t.Callable) -> t.Callable:
+        """Registers the callable as the hook for each of the given event types."""
+        for event in events:
+            EventContext.hooks[event] = func
+        EventContext.hook_events = frozenset(EventContext.hooks)
+        return func
+
     @staticmethod
     def register_hook(event: str):
         """Adds a callable to handle registering context variables for a specific event type."""
-        def decorator(func):
-            EventContext.hooks[event] = func
-            return func
-        return decorator
+        return partial(EventContext._add_hooks, (event,))
+
+    @staticmethod
+    def register_hooks(*events: str):
+        """Adds a callable to handle registering context variables for multiple event types."""
+        return partial(EventContext._add_hooks, events)
 
     @contextmanager
     def default(
         self,
         all_default: t.Any = _NoValue,
         *,
-        message: discord.PartialMessage = _NoValue,
+        message: AnyMessage = _NoValue,
         emoji: Emoji = _NoValue,
         user: MemberUser = _NoValue,
         channel: discord.abc.Messageable = _NoValue,
@@ -216,7 +303,16 @@ class EventContext:
         cmd_ext: commands.Context = _NoValue,
     ):
         """Sets the given context values if isn't already set."""
-        tokens = dict()
+        if (
+            all_default is _NoValue and message is _NoValue and emoji is _NoValue and user is _NoValue
+            and channel is _NoValue and guild is _NoValue and cmd_ext is _NoValue
+        ):
+            yield
+            return
+
+        state = _get_state()
+        new_state = state._copy()
+        defaulted = []
 
         message_default = message if message is not _NoValue else all_default
         emoji_default = emoji if emoji is not _NoValue else all_default
@@ -225,36 +321,49 @@ class EventContext:
         guild_default = guild if guild is not _NoValue else all_default
         cmd_ext_default = cmd_ext if cmd_ext is not _NoValue else all_default
 
-        if (message_default is not _NoValue) and (_ctx_message.get(_NoValue) is _NoValue):
+        if (message_default is not _NoValue) and (state.message is _NoValue):
             log.debug(f"Default set: message = {message_default}")
-            tokens[_ctx_message] = _ctx_message.set(message_default)
-        if (emoji_default is not _NoValue) and (_ctx_emoji.get(_NoValue) is _NoValue):
+            new_state.message = message_default
+            defaulted.append("message")
+        if (emoji_default is not _NoValue) and (state.emoji is _NoValue):
             log.debug(f"Default set: emoji = {emoji_default}")
-            tokens[_ctx_emoji] = _ctx_emoji.set(emoji_default)
-        if (user_default is not _NoValue) and (_ctx_user.get(_NoValue) is _NoValue):
+            new_state.emoji = emoji_default
+            defaulted.append("emoji")
+        if (user_default is not _NoValue) and (state.user is _NoValue):
             log.debug(f"Default set: user = {user_default}")
-            tokens[_ctx_user] = _ctx_user.set(self.ensure_member(user_default, guild=guild or self.guild))
-        if (channel_default is not _NoValue) and (_ctx_channel.get(_NoValue) is _NoValue):
+            new_state.user = self.ensure_member(user_default, guild=guild or self.guild)
+            defaulted.append("user")
+        if (channel_default is not _NoValue) and (state.channel is _NoValue):
             log.debug(f"Default set: channel = {channel_default}")
-            tokens[_ctx_channel] = _ctx_channel.set(channel_default)
-        if (guild_default is not _NoValue) and (_ctx_guild.get(_NoValue) is _NoValue):
+            new_state.channel = channel_default
+            defaulted.append("channel")
+        if (guild_default is not _NoValue) and (state.guild is _NoValue):
             log.debug(f"Default set: guild = {guild_default}")
-            tokens[_ctx_guild] = _ctx_guild.set(guild_default)
-        if (cmd_ext_default is not _NoValue) and (_ctx_cmd.get(_NoValue) is _NoValue):
+            new_state.guild = guild_default
+            defaulted.append("guild")
+        if (cmd_ext_default is not _NoValue) and (state.cmd is _NoValue):
             log.debug(f"Default set: cmd_ext = {cmd_ext_default}")
-            tokens[_ctx_cmd] = _ctx_cmd.set(guild_default)
+            new_state.cmd = cmd_ext_default
+            defaulted.append("cmd")
+
+        if not defaulted:
+            yield
+            return
+
+        _set_state(new_state)
         try:
             yield
         finally:
-            for ctx, token in tokens.items():
-                log.debug(f"Default reverted: {ctx.name}")
-                ctx.reset(token)
+            for name in defaulted:
+                log.debug(f"Default reverted: {name}")
+            current = _get_state()
+            _set_state(state if current is new_state else current._restore(state, defaulted))
 
     @contextmanager
     def ephemeral(
         self,
         *,
-        message: discord.PartialMessage = _NoValue,
+        message: AnyMessage = _NoValue,
         emoji: Emoji = _NoValue,
         user: MemberUser = _NoValue,
         channel: discord.abc.Messageable = _NoValue,
@@ -262,48 +371,88 @@ class EventContext:
         cmd_ext: commands.Context = _NoValue,
     ):
         """Sets the given context values, overriding existing values."""
-        tokens = dict()
+        if (
+            message is _NoValue and emoji is _NoValue and user is _NoValue
+            and channel is _NoValue and guild is _NoValue and cmd_ext is _NoValue
+        ):
+            yield
+            return
+
+        state = _get_state()
+        new_state = state._copy()
+        overridden = []
         if message is not _NoValue:
-            tokens[_ctx_message] = _ctx_message.set(message)
+            new_state.message = message
+            overridden.append("message")
         if emoji is not _NoValue:
-            tokens[_ctx_emoji] = _ctx_emoji.set(emoji)
+            new_state.emoji = emoji
+            overridden.append("emoji")
         if user is not _NoValue:
-            tokens[_ctx_user] = _ctx_user.set(self.ensure_member(user, guild=guild or self.guild))
+            new_state.user = self.ensure_member(user, guild=guild or self.guild)
+            overridden.append("user")
         if channel is not _NoValue:
-            tokens[_ctx_channel] = _ctx_channel.set(channel)
+            new_state.channel = channel
+            overridden.append("channel")
         if guild is not _NoValue:
-            tokens[_ctx_guild] = _ctx_guild.set(guild)
+            new_state.guild = guild
+            overridden.append("guild")
         if cmd_ext is not _NoValue:
-            tokens[_ctx_cmd] = _ctx_cmd.set(cmd_ext)
+            new_state.cmd = cmd_ext
+            overridden.append("cmd")
+
+        _set_state(new_state)
         try:
             yield
         finally:
-            for ctx, token in tokens.items():
-                ctx.reset(token)
+            current = _get_state()
+            _set_state(state if current is new_state else current._restore(state, overridden))
 
     def get_member_instances(self, user: discord.User):
-        return [guild.get_member(user.id) for guild in self.bot.guilds if guild.get_member(user.id)]
+        user_id = user.id
+        members = []
+        for guild in self.bot.guilds:
+            member = guild.get_member(user_id)
+            if member:
+                members.append(member)
+        return members
 
     def ensure_member(self, user, *, guild: discord.Guild = None) -> t.Optional[MemberUser]:
-        if user is _NoValue or user is None:
+        if type(user) is discord.Member:
             return user
-        if isinstance(user, discord.Member):
+        if user is _NoValue or user is None:
             return user
-
-        if isinstance(user, int):
-            user: discord.User = self.bot.get_user(user)
-            if not user:
-                return None
-
         if guild is _NoValue:
             guild = None
+        resolve = _ENSURE_MEMBER_DISPATCH.get(type(user), EventContext._resolve_user)
+        return resolve(self, user, guild)
+
+    def _resolve_member(self, member: discord.Member, _guild: t.Optional[discord.Guild]) -> discord.Member:
+        return member
 
+    def _resolve_user_id(self, user_id: int, guild: t.Optional[discord.Guild]) -> t.Optional[MemberUser]:
         if guild:
-            member = guild.get_member(user.id)
-            return member or user
+            return guild.get_member(user_id) or self.bot.get_user(user_id)
+
+        user: discord.User = self.bot.get_user(user_id)
+        if not user:
+            return None
+        return self._resolve_user(user, None)
+
+    def _resolve_user(self, user: discord.User, guild: t.Optional[discord.Guild]) -> MemberUser:
+        if guild:
+            return guild.get_member(user.id) or user
 
         member_instances = self.get_member_instances(user)
         if len(member_instances) == 1:
             return member_instances[0]
 
         return user
+
+
+_ENSURE_MEMBER_DISPATCH: t.Dict[type, t.Callable] = {
+    discord.Member: EventContext._resolve_member,
+    int: EventContext._resolve_user_id,
+}
+
+
+ctx: EventContext = EventContext()
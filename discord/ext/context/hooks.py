@@ -16,128 +16,110 @@ __all__ = (
 )
 
 
-@EventContext.register_hook("message")
-@EventContext.register_hook("message_delete")
-@EventContext.register_hook("message_edit")
+# Threads and PartialMessageable (uncached channels) only exist from discord.py 2.0,
+# have a guild, and aren't GuildChannel subclasses.
+_GUILD_CHANNEL_TYPES = (discord.abc.GuildChannel,) + tuple(
+    getattr(discord, name) for name in ("Thread", "PartialMessageable") if hasattr(discord, name)
+)
+
+
+@EventContext.register_hooks("message", "message_delete", "message_edit")
 def message_hook(ctx: EventContext, message: discord.Message, *_args):
-    ctx.set(
-        message=discord.PartialMessage(channel=message.channel, id=message.id),
-        user=ctx.ensure_member(message.author),
-        channel=message.channel,
-        guild=message.guild,
-    )
+    author = message.author
+    if not isinstance(author, discord.Member):
+        author = ctx.ensure_member(author, guild=message.guild)
+    ctx.set_message_context(message.channel, message.id, message.guild, author)
 
 
-@EventContext.register_hook("raw_message_delete")
-@EventContext.register_hook("raw_message_edit")
+@EventContext.register_hooks("raw_message_delete", "raw_message_edit")
 def raw_message_hook(ctx: EventContext, payload: discord.RawMessageDeleteEvent):
     if payload.cached_message:
         channel = payload.cached_message.channel
         guild = payload.cached_message.guild
-        user = ctx.ensure_member(payload.cached_message.author, guild=guild)
+        user = payload.cached_message.author
+        if not isinstance(user, discord.Member):
+            user = ctx.ensure_member(user, guild=guild)
     else:
         channel = ctx.client.get_channel(payload.channel_id)
         user = None
-        guild = getattr(channel, "guild", None)
+        guild = channel.guild if isinstance(channel, _GUILD_CHANNEL_TYPES) else None
 
-    ctx.set(
-        message=discord.PartialMessage(channel=channel, id=payload.message_id),
-        user=user,
-        channel=channel,
-        guild=guild
-    )
+    ctx.set_message_context(channel, payload.message_id, guild, user)
 
 
 @EventContext.register_hook("typing")
 def typing_hook(ctx: EventContext, channel: discord.abc.Messageable, user: MemberUser, _when: datetime):
+    guild = channel.guild if isinstance(channel, _GUILD_CHANNEL_TYPES) else None
+    if not isinstance(user, discord.Member):
+        user = ctx.ensure_member(user, guild=guild)
     ctx.set(
         channel=channel,
-        user=ctx.ensure_member(user),
-        guild=getattr(channel, "guild", None),
+        user=user,
+        guild=guild,
     )
 
 
-@EventContext.register_hook("reaction_add")
-@EventContext.register_hook("reaction_remove")
+@EventContext.register_hooks("reaction_add", "reaction_remove")
 def reaction_hook(ctx: EventContext, reaction: discord.Reaction, user: discord.User):
-    ctx.set(
-        message=discord.PartialMessage(channel=reaction.message.channel, id=reaction.message.id),
-        emoji=reaction.emoji,
-        user=ctx.ensure_member(user),
-        channel=reaction.message.channel,
-        guild=reaction.message.guild,
-    )
+    message = reaction.message
+    if not isinstance(user, discord.Member):
+        user = ctx.ensure_member(user, guild=message.guild)
+    ctx.set_message_context(message.channel, message.id, message.guild, user, reaction.emoji)
 
 
-@EventContext.register_hook("raw_reaction_add")
-@EventContext.register_hook("raw_reaction_remove")
+@EventContext.register_hooks("raw_reaction_add", "raw_reaction_remove")
 def raw_reaction_hook(ctx: EventContext, payload: discord.RawReactionActionEvent):
     channel = ctx.client.get_channel(payload.channel_id)
     guild = ctx.client.get_guild(payload.guild_id) if payload.guild_id else None
-    ctx.set(
-        message=discord.PartialMessage(channel=channel, id=payload.message_id),
-        emoji=payload.emoji,
-        user=ctx.ensure_member(payload.user_id, guild=guild),
-        channel=channel,
-        guild=guild,
+    ctx.set_message_context(
+        channel, payload.message_id, guild, ctx.ensure_member(payload.user_id, guild=guild), payload.emoji
     )
 
 
 @EventContext.register_hook("reaction_clear")
 def reaction_clear_hook(ctx: EventContext, message: discord.Message, _reaction: discord.Reaction):
-    ctx.set(
-        message=discord.PartialMessage(channel=message.channel, id=message.id),
-        emoji=_reaction.emoji,
-        channel=message.channel,
-        guild=message.guild,
-    )
+    ctx.set_message_context(message.channel, message.id, message.guild, emoji=_reaction.emoji)
 
 
 @EventContext.register_hook("reaction_clear_emoji")
 def reaction_clear_emoji_hook(ctx: EventContext, reaction: discord.Reaction):
-    ctx.set(
-        message=discord.PartialMessage(channel=reaction.message.channel, id=reaction.message.id),
-        emoji=reaction.emoji,
-        channel=reaction.message.channel,
-        guild=reaction.message.guild,
-    )
+    message = reaction.message
+    ctx.set_message_context(message.channel, message.id, message.guild, emoji=reaction.emoji)
 
 
-@EventContext.register_hook("raw_reaction_clear")
-@EventContext.register_hook("raw_reaction_clear_emoji")
+@EventContext.register_hooks("raw_reaction_clear", "raw_reaction_clear_emoji")
 def raw_reaction_clear_hook(ctx: EventContext, payload: discord.RawReactionClearEvent):
     channel = ctx.client.get_channel(payload.channel_id)
-    ctx.set(
-        message=discord.PartialMessage(channel=channel, id=payload.message_id),
-        channel=channel,
-        guild=ctx.client.get_guild(payload.guild_id) if payload.guild_id else None,
-    )
+    guild = ctx.client.get_guild(payload.guild_id) if payload.guild_id else None
+    ctx.set_message_context(channel, payload.message_id, guild)
 
 
-@EventContext.register_hook("guild_channel_update")
-@EventContext.register_hook("guild_channel_create")
-@EventContext.register_hook("guild_channel_delete")
-@EventContext.register_hook("guild_channel_pins_update")
-@EventContext.register_hook("webhooks_update")
+@EventContext.register_hooks(
+    "guild_channel_update",
+    "guild_channel_create",
+    "guild_channel_delete",
+    "guild_channel_pins_update",
+    "webhooks_update",
+)
 def guild_channel_hook(ctx: EventContext, channel: discord.abc.GuildChannel, *_args):
     # noinspection PyTypeChecker
     ctx.set(channel=channel, guild=channel.guild)
 
 
-@EventContext.register_hook("guild_update")
-@EventContext.register_hook("guild_join")
-@EventContext.register_hook("guild_remove")
-@EventContext.register_hook("guild_integrations_update")
-@EventContext.register_hook("guild_emojis_update")
-@EventContext.register_hook("guild_available")
-@EventContext.register_hook("guild_unavailable")
+@EventContext.register_hooks(
+    "guild_update",
+    "guild_join",
+    "guild_remove",
+    "guild_integrations_update",
+    "guild_emojis_update",
+    "guild_available",
+    "guild_unavailable",
+)
 def guild_hook(ctx: EventContext, guild: discord.Guild, *_args):
     ctx.set(guild=guild)
 
 
-@EventContext.register_hook("member_update")
-@EventContext.register_hook("member_join")
-@EventContext.register_hook("member_remove")
+@EventContext.register_hooks("member_update", "member_join", "member_remove")
 def member_hook(ctx: EventContext, member: discord.Member, *_args):
     ctx.set(
         user=member,
@@ -145,15 +127,12 @@ def member_hook(ctx: EventContext, member: discord.Member, *_args):
     )
 
 
-@EventContext.register_hook("guild_role_update_hook")
-@EventContext.register_hook("guild_role_create_hook")
-@EventContext.register_hook("guild_role_delete_hook")
+@EventContext.register_hooks("guild_role_update_hook", "guild_role_create_hook", "guild_role_delete_hook")
 def guild_role_hook(ctx: EventContext, role: discord.Role, *_args):
     ctx.set(guild=role.guild)
 
 
-@EventContext.register_hook("member_ban_hook")
-@EventContext.register_hook("member_unban_hook")
+@EventContext.register_hooks("member_ban_hook", "member_unban_hook")
 def member_ban_hook(ctx: EventContext, guild: discord.Guild, user: MemberUser):
     ctx.set(user=user, guild=guild)
 
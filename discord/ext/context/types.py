@@ -2,7 +2,9 @@ import typing as t
 
 import discord
 
-__all__ = ('MemberUser', 'Emoji')
+__all__ = ('MemberUser', 'Emoji', 'AnyMessage', 'MessageRef')
 
 MemberUser = t.Union[discord.Member, discord.User]
 Emoji = t.Union[discord.Emoji, discord.PartialEmoji]
+AnyMessage = t.Union[discord.PartialMessage, discord.Message]
+MessageRef = t.Tuple[discord.abc.Messageable, int]